@@ -0,0 +1,48 @@
+"""
+Backfill display_name / date_str / time_str on existing test_runs documents.
+
+save_run() now stores these parsed run-name fields on every write; runs saved
+before that still fall back to parsing run_name on the dashboard. This script
+fills them in once so the dashboard can read them directly.
+"""
+import os
+
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from modules.run_names import parse_run_name
+
+# ---------------------------------------------------------------------------
+# Connect to MongoDB
+# ---------------------------------------------------------------------------
+uri = os.getenv("MONGODB_URI")
+if not uri:
+    with open(".env") as f:
+        for line in f:
+            if line.startswith("MONGODB_URI="):
+                uri = line.split("=", 1)[1].strip()
+                break
+
+client = MongoClient(uri)
+db = client["PO2xNW"]
+runs_coll = db["test_runs"]
+
+# ---------------------------------------------------------------------------
+# Backfill runs missing the stored display fields
+# ---------------------------------------------------------------------------
+ops = []
+for run in runs_coll.find({"display_name": {"$exists": False}}, {"run_name": 1}):
+    info = parse_run_name(run.get("run_name", "Unknown"))
+    ops.append(UpdateOne({"_id": run["_id"]}, {"$set": {
+        "display_name": info["display_name"],
+        "date_str": info["date_str"],
+        "time_str": info["time_str"],
+    }}))
+
+if not ops:
+    print("✅ All runs already have display fields. Nothing to do.")
+else:
+    result = runs_coll.bulk_write(ops, ordered=False)
+    print(f"✅ Backfilled {result.modified_count} of {len(ops)} runs")
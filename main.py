@@ -23,10 +23,11 @@ from modules.db import save_run
 # ---------------------------------------------------------------------------
 # Load test documents from MongoDB (fallback to local files)
 # ---------------------------------------------------------------------------
-@st.cache_data(ttl=600)
+@st.cache_data(ttl=3600)
 def load_test_docs():
+    # PDF bytes are fetched per document at submit time
     coll = get_test_documents_collection()
-    return list(coll.find().sort("filename", 1))
+    return list(coll.find({}, {"file_data": 0}).sort("filename", 1))
 
 
 @st.cache_data(ttl=600)
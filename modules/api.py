@@ -33,10 +33,19 @@ def build_metadata(filename):
 
 
 def submit_from_mongo(doc):
-    """POST a document loaded from MongoDB test_documents collection."""
+    """POST a document loaded from MongoDB test_documents collection.
+
+    Document lists are loaded without file_data; the PDF bytes are fetched
+    here, only for the document being submitted.
+    """
     filename = doc["filename"]
     metadata = build_metadata(filename)
-    file_bytes = bytes(doc["file_data"])
+    file_data = doc.get("file_data")
+    if file_data is None:
+        from modules.db import get_test_documents_collection
+        stored = get_test_documents_collection().find_one({"_id": doc["_id"]}, {"file_data": 1})
+        file_data = stored["file_data"]
+    file_bytes = bytes(file_data)
     files = {"file": (filename, file_bytes, "application/pdf")}
     data = {"metadata": json.dumps(metadata)}
     response = requests.post(API_URL, files=files, data=data, timeout=600)
@@ -109,7 +109,7 @@ def _process_single_tc(item, use_mongo, gt_keys, gt_df, run_name):
     gt_metrics = None
 
     if success:
-        full_response = json.loads(resp.text)
+        full_response = json.loads(resp.content)
         doc_name = meta["document_metadata"]["document_name"]
         coll = get_results_collection()
         mongo_doc = coll.find_one(
@@ -137,8 +137,8 @@ def _process_single_tc(item, use_mongo, gt_keys, gt_df, run_name):
     return {
         "status_code": resp.status_code,
         "success": success,
-        "response": resp.text[:5000],
-        "findings": parse_findings_summary(resp.text) if success else {},
+        "response": resp.content[:5000].decode("utf-8", errors="replace"),
+        "findings": parse_findings_summary(full_response) if success else {},
         "full_response": full_response,
         "mongo_doc_id": mongo_doc_id,
         "gt_metrics": gt_metrics,
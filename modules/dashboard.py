@@ -0,0 +1,262 @@
+"""
+Data loading and rendering helpers for the Runs Dashboard page.
+"""
+import pandas as pd
+import streamlit as st
+from bson import ObjectId
+
+from modules.db import get_runs_collection
+from modules.run_names import parse_run_name
+
+
+# Fields needed for the run list; per-theme/per-TC details load per run.
+RUN_LIST_PROJECTION = {
+    "run_name": 1, "display_name": 1, "date_str": 1, "time_str": 1,
+    "timestamp": 1, "run_by": 1, "prompt_label": 1,
+    "test_cases_run": 1, "metrics": 1,
+}
+
+# Run Log columns, flattened and defaulted by MongoDB into each run's "log".
+RUN_LOG_FIELDS = {
+    "Run By": {"$ifNull": ["$run_by", ""]},
+    "Prompt Change": {"$ifNull": ["$prompt_label", ""]},
+    "TCs": {"$ifNull": ["$test_cases_run", 0]},
+    "TP": {"$ifNull": ["$metrics.tp", 0]},
+    "FP": {"$ifNull": ["$metrics.fp", 0]},
+    "FN": {"$ifNull": ["$metrics.fn", 0]},
+    "Precision": {"$ifNull": ["$metrics.precision", 0]},
+    "Recall": {"$ifNull": ["$metrics.recall", 0]},
+}
+
+# True when the run stored a per-theme or per-TC breakdown (legacy runs did not).
+HAS_DETAILS = {"$or": [
+    {"$ne": [{"$ifNull": ["$per_theme_metrics", {}]}, {}]},
+    {"$ne": [{"$ifNull": ["$per_tc_metrics", {}]}, {}]},
+]}
+
+# Rates are stored as fractions; tables show them as 0-100 floats so they stay sortable.
+PERCENT_COLUMNS = {
+    col: st.column_config.NumberColumn(col, format="%.1f%%")
+    for col in ("Precision", "Recall", "F1")
+}
+
+# Metric fields read from per-theme / per-TC dicts; missing or None -> 0.
+COUNT_FIELDS = ["expected", "tp", "fp", "fn"]
+THEME_RATE_FIELDS = COUNT_FIELDS + ["precision", "recall", "f1"]
+TC_FIELDS = COUNT_FIELDS + ["relevant_found", "unscored"]
+TC_THEME_FIELDS = ["expected", "found", "tp", "fp", "fn"]
+FINDINGS_PREVIEW_ROWS = 200  # per-TC findings rows shown until "Show all" is ticked
+METRIC_LABELS = {
+    "expected": "Expected", "found": "Found", "tp": "TP", "fp": "FP", "fn": "FN",
+    "precision": "Precision", "recall": "Recall", "f1": "F1",
+}
+
+# Static confusion-summary cards; only the six numbers change per run.
+_SUMMARY_TPL = """
+<div style="display:flex; gap:12px; margin-bottom:16px;">
+    <div style="background:#e6f4ea; border-left:4px solid #34a853; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">True Positives</div>
+        <div style="font-size:28px; font-weight:700; color:#1e7e34;">{tp}</div>
+    </div>
+    <div style="background:#fce8e6; border-left:4px solid #ea4335; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">False Positives</div>
+        <div style="font-size:28px; font-weight:700; color:#c5221f;">{fp}</div>
+    </div>
+    <div style="background:#fff3e0; border-left:4px solid #f9ab00; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">False Negatives</div>
+        <div style="font-size:28px; font-weight:700; color:#e37400;">{fn}</div>
+    </div>
+    <div style="background:#e8f0fe; border-left:4px solid #4285f4; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">Precision</div>
+        <div style="font-size:28px; font-weight:700; color:#1a73e8;">{precision:.1%}</div>
+    </div>
+    <div style="background:#e8f0fe; border-left:4px solid #4285f4; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">Recall</div>
+        <div style="font-size:28px; font-weight:700; color:#1a73e8;">{recall:.1%}</div>
+    </div>
+    <div style="background:#e8f0fe; border-left:4px solid #4285f4; padding:12px 20px; border-radius:4px; flex:1; text-align:center;">
+        <div style="font-size:13px; color:#555;">F1 Score</div>
+        <div style="font-size:28px; font-weight:700; color:#1a73e8;">{f1:.1%}</div>
+    </div>
+</div>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+@st.cache_data(ttl=60)
+def load_runs(limit):
+    """Load the latest `limit` runs from MongoDB (summary fields + Run Log columns)."""
+    coll = get_runs_collection()
+    runs = list(coll.aggregate([
+        {"$sort": {"timestamp": -1}},  # Most recent first
+        {"$limit": limit},
+        {"$project": {**RUN_LIST_PROJECTION, "log": RUN_LOG_FIELDS, "has_details": HAS_DETAILS}},
+    ], batchSize=50))
+    return runs
+
+
+@st.cache_data(ttl=60)
+def load_run_detail(run_id):
+    """Load the per-theme and per-TC breakdown for a single run."""
+    coll = get_runs_collection()
+    return coll.find_one(
+        {"_id": ObjectId(run_id)},
+        projection={"per_theme_metrics": 1, "per_tc_metrics": 1},
+    ) or {}
+
+
+def run_info(run):
+    """Display fields stored on the run, parsed from run_name for older runs."""
+    if run.get("display_name"):
+        return run
+    return parse_run_name(run.get("run_name", "Unknown"))
+
+
+def runs_key(runs):
+    """Lightweight cache key identifying the current run list."""
+    return tuple((str(r["_id"]), r.get("timestamp")) for r in runs)
+
+
+# ---------------------------------------------------------------------------
+# Run list tables and labels
+# ---------------------------------------------------------------------------
+def _pct_or_blank(values):
+    """Scale a fraction column to percent, leaving zero/missing rates blank."""
+    values = values.fillna(0).astype(float) * 100
+    return values.where(values != 0)
+
+
+@st.cache_data(ttl=60)
+def build_run_log_df(runs_key, _runs):
+    """Build the Run Log table. Cached on runs_key; _runs is not hashed."""
+    names = pd.DataFrame(
+        [(i["display_name"], i["date_str"], i["time_str"]) for i in map(run_info, _runs)],
+        columns=["Run Name", "Date", "Time"],
+    )
+    df = pd.concat([
+        names,
+        pd.DataFrame([r["log"] for r in _runs], columns=list(RUN_LOG_FIELDS)),
+    ], axis=1)
+    df["Precision"] = _pct_or_blank(df["Precision"])
+    df["Recall"] = _pct_or_blank(df["Recall"])
+    return df
+
+
+@st.cache_data(ttl=60)
+def compute_labels(runs_key, _runs):
+    """Per-run (id, display name, comparison label, delete label), computed once."""
+    labels = []
+    for r in _runs:
+        info = run_info(r)
+        prompt = r.get("prompt_label", "")
+        suffix = f"  [{prompt}]" if prompt else ""
+        labels.append((
+            r["_id"],
+            info["display_name"],
+            f"{info['display_name']}  ({info['date_str']}){suffix}",
+            f"{info['display_name']}  —  {r.get('test_cases_run', 0)} TCs, "
+            f"F1: {r.get('metrics', {}).get('f1', 0):.1%}",
+        ))
+    return labels
+
+
+# ---------------------------------------------------------------------------
+# Per-run detail rendering
+# ---------------------------------------------------------------------------
+def _metrics_frame(by_key, key_col, fields):
+    """One row per key of a {key: metrics} dict, sorted by key, limited to fields."""
+    # Older runs stored per-TC/per-theme dicts unsorted, so sort on read
+    df = pd.DataFrame.from_records(
+        {key_col: key, **m} for key, m in sorted(by_key.items())
+    )
+    return df.reindex(columns=[key_col, *fields])
+
+
+def render_confusion_summary(metrics):
+    """Colored TP/FP/FN/Precision/Recall/F1 cards for a run's metrics."""
+    st.markdown(
+        _SUMMARY_TPL.format_map({
+            key: metrics.get(key, 0) or 0
+            for key in ("tp", "fp", "fn", "precision", "recall", "f1")
+        }),
+        unsafe_allow_html=True,
+    )
+
+
+def render_theme_table(per_theme):
+    """By Theme table from a run's per_theme_metrics."""
+    t_df = _metrics_frame(per_theme, "Theme", THEME_RATE_FIELDS)
+    t_df[COUNT_FIELDS] = t_df[COUNT_FIELDS].fillna(0).astype(int)
+    t_df["API Found"] = t_df["tp"] + t_df["fp"]
+    rate_cols = ["precision", "recall", "f1"]
+    t_df[rate_cols] = t_df[rate_cols].fillna(0).astype(float) * 100
+    st.dataframe(
+        t_df.rename(columns=METRIC_LABELS | {"expected": "GT Expected"})[
+            ["Theme", "GT Expected", "API Found", "TP", "FP", "FN",
+             "Precision", "Recall", "F1"]
+        ],
+        use_container_width=True, hide_index=True,
+        column_config=PERCENT_COLUMNS,
+    )
+
+
+def render_tc_block(run_id, per_tc):
+    """One expander per test case with its theme table and findings."""
+    tc_df = _metrics_frame(per_tc, "tc_name", TC_FIELDS)
+    tc_df[COUNT_FIELDS + ["unscored"]] = tc_df[COUNT_FIELDS + ["unscored"]].fillna(0).astype(int)
+    tc_df["relevant_found"] = (
+        tc_df["relevant_found"].fillna(tc_df["tp"] + tc_df["fp"]).astype(int)
+    )
+
+    for tc_name, tc_exp, tc_tp, tc_fp, tc_fn, tc_found, tc_unscored in tc_df[
+        ["tc_name", "expected", "tp", "fp", "fn", "relevant_found", "unscored"]
+    ].itertuples(index=False):
+        tc_m = per_tc[tc_name]
+        label = f"{tc_name} — Expected: {tc_exp} | Found: {tc_found} | TP: {tc_tp} | FP: {tc_fp} | FN: {tc_fn}"
+        if tc_unscored:
+            label += f" | Unscored: {tc_unscored}"
+
+        with st.expander(label, expanded=False):
+            tc_themes = tc_m.get("per_theme", {})
+            findings = tc_m.get("findings", [])
+            if not tc_themes and not findings:
+                if tc_found == 0:
+                    st.caption("No findings for this test case.")
+                else:
+                    # Old runs without detailed data
+                    st.caption("Detailed per-theme and findings data not available for this run. Re-run the test case to populate.")
+                    st.markdown(f"**Expected:** {tc_exp} &nbsp; **Found:** {tc_found} &nbsp; **TP:** {tc_tp} &nbsp; **FP:** {tc_fp} &nbsp; **FN:** {tc_fn}")
+                continue
+
+            # Per-theme for this TC
+            if tc_themes:
+                tm_df = _metrics_frame(tc_themes, "Theme", TC_THEME_FIELDS)
+                tm_df[TC_THEME_FIELDS] = tm_df[TC_THEME_FIELDS].fillna(0).astype(int)
+                st.dataframe(
+                    tm_df.rename(columns=METRIC_LABELS),
+                    use_container_width=True, hide_index=True,
+                )
+
+            # Detailed findings
+            if findings:
+                st.markdown("**Findings**")
+                shown = findings
+                if len(findings) > FINDINGS_PREVIEW_ROWS and not st.checkbox(
+                    f"Show all {len(findings)}", key=f"all_{run_id}_{tc_name}",
+                ):
+                    shown = findings[:FINDINGS_PREVIEW_ROWS]
+                st.dataframe(
+                    pd.DataFrame(shown),
+                    use_container_width=True, hide_index=True,
+                    column_config={
+                        "gt_status": st.column_config.TextColumn("GT", width="small"),
+                        "theme": st.column_config.TextColumn("Theme", width="small"),
+                        "page": st.column_config.TextColumn("Page", width="small"),
+                        "sentence": st.column_config.TextColumn("Sentence", width="large"),
+                        "category": st.column_config.TextColumn("Category", width="medium"),
+                    },
+                )
+            elif tc_found == 0:
+                st.caption("No findings for this test case.")
@@ -1,11 +1,15 @@
+import logging
 import os
 from datetime import datetime
 
 import streamlit as st
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
 from bson import ObjectId
 from modules.config import REVIEW_FIELDS
 
+logger = logging.getLogger(__name__)
+
 
 @st.cache_resource
 def get_client():
@@ -13,7 +17,15 @@ def get_client():
     if not uri:
         st.error("MONGODB_URI not found in .env or Streamlit secrets")
         st.stop()
-    return MongoClient(uri)
+    return MongoClient(
+        uri,
+        maxPoolSize=32,
+        minPoolSize=4,
+        socketTimeoutMS=30000,
+        serverSelectionTimeoutMS=5000,
+        retryWrites=True,
+        compressors="zlib",
+    )
 
 
 def get_db():
@@ -40,13 +52,27 @@ def get_golden_category_status_collection():
     return get_db()["golden_category_status"]
 
 
+@st.cache_resource
+def _ensure_runs_indexes():
+    """Create test_runs indexes once per process (create_index is idempotent).
+
+    Best effort: a read-only user can't create indexes but can still read runs.
+    """
+    try:
+        get_db()["test_runs"].create_index([("timestamp", -1)])
+    except OperationFailure as e:
+        logger.warning("Could not create test_runs timestamp index: %s", e)
+
+
 def get_runs_collection():
+    _ensure_runs_indexes()
     return get_db()["test_runs"]
 
 
 def save_run(run_name, results, prompt_label="", run_by=""):
     """Aggregate session results and upsert into test_runs collection."""
     from modules.naming import short_name
+    from modules.run_names import parse_run_name
 
     agg = {"tp": 0, "fp": 0, "fn": 0, "suppressed": 0,
            "expected": 0, "found": 0, "relevant_found": 0}
@@ -93,8 +119,13 @@ def save_run(run_name, results, prompt_label="", run_by=""):
     agg["recall"] = round(recall, 4)
     agg["f1"] = round(f1, 4)
 
+    run_info = parse_run_name(run_name)
     doc = {
         "run_name": run_name,
+        # Pre-parsed so the dashboard doesn't re-parse run_name on every render
+        "display_name": run_info["display_name"],
+        "date_str": run_info["date_str"],
+        "time_str": run_info["time_str"],
         "timestamp": datetime.utcnow(),
         "test_cases_run": tc_count,
         "metrics": agg,
@@ -116,27 +147,32 @@ def save_run(run_name, results, prompt_label="", run_by=""):
 # ---------------------------------------------------------------------------
 # simple_viewer.py write-back (PO2_testing collection)
 # ---------------------------------------------------------------------------
+def _review_update(row):
+    """$set of a finding's review fields, addressed by its section path."""
+    base_path = f"{row['_source']}.{row['_art_key']}.sections.{row['_section_idx']}"
+    return {"$set": {f"{base_path}.{field}": row[field] for field in REVIEW_FIELDS}}
+
+
 def save_finding(row):
     """Persist a single finding's review fields back to MongoDB."""
     coll = get_results_collection()
-    doc_id = ObjectId(row["_doc_id"])
-    base_path = f"{row['_source']}.{row['_art_key']}.sections.{row['_section_idx']}"
-    update = {f"{base_path}.{field}": row[field] for field in REVIEW_FIELDS}
-    coll.update_one({"_id": doc_id}, {"$set": update})
+    coll.update_one({"_id": ObjectId(row["_doc_id"])}, _review_update(row))
 
 
 def save_all_changes(original_df, edited_df):
     """Compare original vs edited, persist only changed rows. Returns count."""
-    changed = 0
-    for idx in edited_df.index:
-        if idx not in original_df.index:
-            continue
-        orig = original_df.loc[idx]
-        edit = edited_df.loc[idx]
-        if any(orig[f] != edit[f] for f in REVIEW_FIELDS):
-            save_finding(edit)
-            changed += 1
-    return changed
+    common = edited_df.index.intersection(original_df.index)
+    edited = edited_df.loc[common]
+    # Vectorized diff of the review fields instead of comparing row by row
+    changed_mask = original_df.loc[common, REVIEW_FIELDS].ne(edited[REVIEW_FIELDS]).any(axis=1)
+    ops = [
+        UpdateOne({"_id": ObjectId(row["_doc_id"])}, _review_update(row))
+        for row in edited[changed_mask].to_dict("records")
+    ]
+    # One round-trip for all changed rows
+    if ops:
+        get_results_collection().bulk_write(ops, ordered=False)
+    return len(ops)
 
 
 # ---------------------------------------------------------------------------
@@ -31,6 +31,14 @@ def load_ground_truth():
     return keys, gt_df
 
 
+def _page_int(page):
+    """Normalize a page value (int, str, NaN, empty) to an int, defaulting to 0."""
+    try:
+        return int(page) if (pd.notna(page) and str(page).strip()) else 0
+    except (ValueError, TypeError):
+        return 0
+
+
 def is_ground_truth(tc_number, page, sentence, gt_keys):
     """Check if a finding matches any ground truth entry."""
     if not gt_keys:
@@ -39,10 +47,7 @@ def is_ground_truth(tc_number, page, sentence, gt_keys):
     tc = str(tc_number).strip()
 
     # Handle empty strings and NaN values
-    try:
-        pg = int(page) if (pd.notna(page) and str(page).strip()) else 0
-    except (ValueError, TypeError):
-        pg = 0
+    pg = _page_int(page)
 
     sent = str(sentence).strip().lower()
 
@@ -178,35 +183,40 @@ def get_missing_gt_findings(gt_df, tc_number, found_findings, gt_keys):
         gt_df: Ground truth DataFrame
         tc_number: Test case number
         found_findings: List of findings found by API
-        gt_keys: Set of GT keys
+        gt_keys: Set of GT keys (unused; rows are matched against found_findings directly)
 
     Returns:
         List of missing GT findings with details
     """
     tc_gt = gt_df[gt_df["TC Id"].str.strip().str.upper() == tc_number.upper()]
-    missing = []
 
-    for _, gt_row in tc_gt.iterrows():
-        page = int(gt_row.get("Page Number", 0)) if pd.notna(gt_row.get("Page Number")) else 0
-        sentence = str(gt_row.get("Non compliant", "")).strip()
-
-        # Check if this GT finding was found by API
-        found = False
-        for finding in found_findings:
-            if is_ground_truth(tc_number, finding.get("page"), finding.get("sentence"), gt_keys):
-                # Check if it matches this specific GT entry
-                if page == finding.get("page") and sentence[:50].lower() in str(finding.get("sentence", "")).lower():
-                    found = True
-                    break
-
-        if not found:
-            missing.append({
-                "page": page,
-                "sentence": sentence,
-                "category": gt_row.get("category", ""),
-                "sub_bucket": gt_row.get("sub_bucket", ""),
-                "reasoning": gt_row.get("observations", ""),
-                "rule_citation": gt_row.get("rule_citation", ""),
-            })
+    # Index found findings once: exact (page, prefix) pairs plus per-page
+    # sentences for the substring fallback used by is_ground_truth.
+    found_set = set()
+    found_by_page = {}
+    for f in found_findings:
+        page = _page_int(f.get("page"))
+        sent = str(f.get("sentence", "")).strip().lower()
+        found_set.add((page, sent[:50]))
+        found_by_page.setdefault(page, []).append(sent)
+
+    pages = [_page_int(p) for p in tc_gt.get("page_number", pd.Series(0, index=tc_gt.index))]
+    sentences = tc_gt.get("sentence", pd.Series("", index=tc_gt.index)).fillna("").astype(str).str.strip()
+
+    missing = []
+    for (_, gt_row), page, sentence in zip(tc_gt.iterrows(), pages, sentences):
+        prefix = sentence[:50].lower()
+        if (page, prefix) in found_set:
+            continue
+        if prefix and any(prefix in s for s in found_by_page.get(page, ())):
+            continue
+        missing.append({
+            "page": page,
+            "sentence": sentence,
+            "category": gt_row.get("category", ""),
+            "sub_bucket": gt_row.get("sub_bucket", ""),
+            "reasoning": gt_row.get("observations", ""),
+            "rule_citation": gt_row.get("rule_citation", ""),
+        })
 
     return missing
@@ -1,9 +1,29 @@
+import functools
 import re
 from modules.config import DOC_TYPE_MAP
 
 
+# Compiled once; short_name/tc_sort_key run for every file on every rerun.
+_TC_NUM_RE = re.compile(r"TC(\d+)")
+_TC_RE = re.compile(r"(TC\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+_VARIANT_RE = re.compile(r"[-_ ](1[A-C])\b")
+_TC_SPLIT_RE = re.compile(r"TC\d+[_]?")
+_WS_RE = re.compile(r"\s+")
+_TAIL_NOISE = [
+    (re.compile(r"^(FS|PP|CM|BR|RMCM)[_ ]+"), ""),
+    (re.compile(r"^2[_ ]*(?:Updated)?[_ ]*"), ""),
+    (re.compile(r"(?:TEST SAMPLE|Test Sample)"), ""),
+    (re.compile(r"(?:Updated)"), ""),
+    (re.compile(r"Copy of 2"), ""),
+    (re.compile(r"[_ ]*\d{0,2}[A-Z]{0,3}\d{4}[_ ]*"), " "),  # date patterns
+    (re.compile(r"[-_ ]*(1[A-C])\b"), ""),
+]
+
+
+@functools.lru_cache(maxsize=1024)
 def tc_sort_key(filename):
-    m = re.search(r"TC(\d+)", filename)
+    m = _TC_NUM_RE.search(filename)
     return int(m.group(1)) if m else 999
 
 
@@ -15,34 +35,30 @@ def guess_doc_type(filename):
     return "Marketing Material"
 
 
+@functools.lru_cache(maxsize=1024)
 def short_name(filename):
     """Extract TC number and short description from filename."""
     name = filename.replace(".pdf", "")
-    tc_match = re.search(r"(TC\d+)", name)
+    tc_match = _TC_RE.search(name)
     tc = tc_match.group(1) if tc_match else "TC?"
-    tc_num = re.search(r"\d+", tc)
+    tc_num = _DIGITS_RE.search(tc)
     if tc_num:
         tc = f"TC{int(tc_num.group()):02d}"
 
     variant = ""
-    v_match = re.search(r"[-_ ](1[A-C])\b", name)
+    v_match = _VARIANT_RE.search(name)
     if v_match:
         variant = f" ({v_match.group(1)})"
     if "Copy of" in name:
         variant = " (alt)"
 
-    after_tc = re.split(r"TC\d+[_]?", name, maxsplit=1)
+    after_tc = _TC_SPLIT_RE.split(name, maxsplit=1)
     tail = after_tc[1].strip("_ ") if len(after_tc) > 1 else name
 
-    tail = re.sub(r"^(FS|PP|CM|BR|RMCM)[_ ]+", "", tail)
-    tail = re.sub(r"^2[_ ]*(?:Updated)?[_ ]*", "", tail)
-    tail = re.sub(r"(?:TEST SAMPLE|Test Sample)", "", tail)
-    tail = re.sub(r"(?:Updated)", "", tail)
-    tail = re.sub(r"Copy of 2", "", tail)
-    tail = re.sub(r"[_ ]*\d{0,2}[A-Z]{0,3}\d{4}[_ ]*", " ", tail)
-    tail = re.sub(r"[-_ ]*(1[A-C])\b", "", tail)
+    for pattern, repl in _TAIL_NOISE:
+        tail = pattern.sub(repl, tail)
     tail = tail.replace("_", " ")
-    tail = re.sub(r"\s+", " ", tail).strip(" -_")
+    tail = _WS_RE.sub(" ", tail).strip(" -_")
 
     if not tail:
         tail = guess_doc_type(filename)
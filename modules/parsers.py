@@ -1,24 +1,47 @@
+import functools
 import json
+import sys
 from collections import Counter
 from modules.config import ARTIFACT_TYPES, CATEGORY_THEMES, THEME_ORDER
 
 
+# Lowercased once; cat_to_theme runs for every finding on every rerun.
+_THEME_BY_KEY_LOWER = {k.lower(): v for k, v in CATEGORY_THEMES.items()}
+_THEME_FIRST_WORD = [(k.split()[0].lower(), v) for k, v in CATEGORY_THEMES.items()]
+
+
+@functools.lru_cache(maxsize=512)
 def cat_to_theme(cat):
     """Map a raw category name to its short theme label (T1-T9)."""
-    for key, theme in CATEGORY_THEMES.items():
-        if key.lower() in cat.lower() or cat.lower() in key.lower():
+    cl = cat.lower()
+    theme = _THEME_BY_KEY_LOWER.get(cl)
+    if theme:
+        return theme
+    for key, theme in _THEME_BY_KEY_LOWER.items():
+        if key in cl or cl in key:
             return theme
-    for key, theme in CATEGORY_THEMES.items():
-        if key.split()[0].lower() in cat.lower():
+    # Fuzzy: match first significant word
+    for word, theme in _THEME_FIRST_WORD:
+        if word in cl:
             return theme
     return cat[:25]
 
 
-def parse_findings_summary(resp_text):
-    """Parse API response text -> {category: count} for summary display."""
-    try:
-        data = json.loads(resp_text)
-    except Exception:
+def parse_findings_summary(resp_body):
+    """Parse an API response -> {category: count} for summary display.
+
+    Accepts the raw body (bytes or str) or an already-parsed response dict,
+    so callers that need the full response only parse it once.
+    """
+    if isinstance(resp_body, dict):
+        data = resp_body
+    else:
+        try:
+            data = json.loads(resp_body)
+        except Exception:
+            return {}
+    # Error payloads / empty results: nothing to count
+    if not isinstance(data, dict) or not (data.get("raw_output") or data.get("sequential_reasoner")):
         return {}
     categories = Counter()
     total = 0
@@ -50,23 +73,30 @@ def extract_findings_for_review(doc_id, data, source_key="raw_output"):
     Returns:
         List of dicts with finding fields + _doc_id/_source/_art_key/_section_idx
     """
+    # Repeated string fields are interned so large review sets share one
+    # object per distinct value instead of one per row.
+    doc_id = sys.intern(str(doc_id))
+    source_key = sys.intern(source_key)
     rows = []
     for art_key in ARTIFACT_TYPES:
         art = data.get(art_key, {})
         if not isinstance(art, dict):
             continue
+        art_key = sys.intern(art_key)
+        artifact_type = sys.intern(art_key.replace("_artifact", ""))
         for idx, s in enumerate(art.get("sections", [])):
+            category = s.get("category", "N/A")
             rows.append({
-                "_doc_id": str(doc_id),
+                "_doc_id": doc_id,
                 "_source": source_key,
                 "_art_key": art_key,
                 "_section_idx": idx,
-                "artifact_type": art_key.replace("_artifact", ""),
+                "artifact_type": artifact_type,
                 "sentence": s.get("sentence", ""),
                 "page": s.get("page_number", ""),
                 "rule_citation": s.get("rule_citation", ""),
                 "recommendations": s.get("recommendations", ""),
-                "category": s.get("category", "N/A"),
+                "category": sys.intern(category) if isinstance(category, str) else category,
                 "observations": s.get("observations", ""),
                 "summary": s.get("summary", ""),
                 "accept": bool(s.get("accept", False)),
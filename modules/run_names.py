@@ -1,6 +1,7 @@
 """
 Generate cute random names for test runs with timestamps.
 """
+import functools
 import random
 from datetime import datetime
 
@@ -16,6 +17,14 @@ CUTE_NAMES = [
     "Teddy", "Toby", "Yoshi", "Chip", "Doodle", "Fluffy", "Happy", "Lucky"
 ]
 
+_RUN_TS_FORMAT = "%Y-%m-%d-%H-%M-%S"
+_TIMESTAMP_STR_FORMAT = "%b %d, %Y %I:%M:%S %p"
+_DATE_STR_FORMAT = "%d %b"
+_TIME_STR_FORMAT = "%H:%M"
+
+# Private generator so run-name picks don't share the global random state.
+_rng = random.Random()
+
 
 def _used_names():
     """Get names already used in existing runs."""
@@ -38,23 +47,25 @@ def generate_run_name():
     available = [n for n in CUTE_NAMES if n not in used]
 
     if available:
-        cute_name = random.choice(available)
+        cute_name = _rng.choice(available)
     else:
         # All single names used — combine two for a fresh name
         while True:
-            combo = random.choice(CUTE_NAMES) + random.choice(CUTE_NAMES)
+            combo = _rng.choice(CUTE_NAMES) + _rng.choice(CUTE_NAMES)
             if combo not in used:
                 cute_name = combo
                 break
 
-    timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-    return f"{cute_name}-{timestamp}"
+    return "%s-%s" % (cute_name, datetime.now().strftime(_RUN_TS_FORMAT))
 
 
+@functools.lru_cache(maxsize=512)
 def parse_run_name(run_name):
     """
     Parse a run name to extract components.
 
+    Results are memoized per run_name; treat the returned dict as read-only.
+
     Returns:
         dict with name, timestamp, display_name
     """
@@ -62,21 +73,25 @@ def parse_run_name(run_name):
 
     if len(parts) >= 7:
         name = parts[0]
-        timestamp_str = "-".join(parts[1:7])  # YYYY-MM-DD-HH-MM-SS
 
         try:
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d-%H-%M-%S")
+            # Fixed YYYY-MM-DD-HH-MM-SS layout: build the datetime directly
+            timestamp = datetime(*(int(p) for p in parts[1:7]))
+        except ValueError:
+            try:
+                timestamp = datetime.strptime("-".join(parts[1:7]), _RUN_TS_FORMAT)
+            except ValueError:
+                timestamp = None
 
+        if timestamp is not None:
             return {
                 "name": name,
                 "timestamp": timestamp,
                 "display_name": name,
-                "timestamp_str": timestamp.strftime("%b %d, %Y %I:%M:%S %p"),
-                "date_str": timestamp.strftime("%d %b"),
-                "time_str": timestamp.strftime("%H:%M"),
+                "timestamp_str": timestamp.strftime(_TIMESTAMP_STR_FORMAT),
+                "date_str": timestamp.strftime(_DATE_STR_FORMAT),
+                "time_str": timestamp.strftime(_TIME_STR_FORMAT),
             }
-        except ValueError:
-            pass
 
     # Fallback for unparseable names
     return {
@@ -99,7 +99,7 @@ capture_btn = st.button(
 # ---------------------------------------------------------------------------
 if capture_btn:
     # Load test documents
-    test_docs = list(test_docs_coll.find().sort("filename", 1))
+    test_docs = list(test_docs_coll.find({}, {"file_data": 0}).sort("filename", 1))
     use_mongo = len(test_docs) > 0
 
     if not use_mongo:
@@ -155,8 +155,8 @@ if capture_btn:
                 resp, meta = submit_document(item)
 
             if resp.status_code == 200:
-                full_response = json.loads(resp.text)
-                findings = parse_findings_summary(resp.text)
+                full_response = json.loads(resp.content)
+                findings = parse_findings_summary(full_response)
 
                 golden_coll.insert_one({
                     "filename": name,
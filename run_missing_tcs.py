@@ -1,13 +1,17 @@
 """Run missing TCs for silver_v1 golden baseline capture using local PDF files."""
 
+import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+from bson.errors import InvalidDocument
 from dotenv import load_dotenv
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, ConnectionFailure, DuplicateKeyError, PyMongoError
 
 load_dotenv()
 
@@ -16,19 +20,39 @@ from modules.parsers import parse_findings_summary
 from modules.naming import tc_sort_key, short_name
 from modules.config import TEST_DOCS_DIR
 
+# Parse args before connecting so --help / bad values exit without touching MongoDB
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument(
+    "--workers", type=int, default=8,
+    help="concurrent API submissions (1 runs them one at a time)",
+)
+args = parser.parse_args()
+if args.workers < 1:
+    parser.error("--workers must be at least 1")
+MAX_WORKERS = args.workers  # Submissions wait on the API, so run several at once
+
 MONGODB_URI = os.getenv("MONGODB_URI")
-client = MongoClient(MONGODB_URI)
+client = MongoClient(
+    MONGODB_URI,
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+    waitQueueTimeoutMS=30000,
+)
 db = client["PO2xNW"]
 golden_coll = db["golden_outputs"]
+# Idempotent; lets the distinct() below read tc_numbers straight from the index
+golden_coll.create_index([("run_label", 1), ("tc_number", 1)], name="run_tc_idx")
 
 RUN_LABEL = "silver_v1"
+INSERT_BATCH_SIZE = 16  # Golden outputs buffered per insert_many
 
 # Find which TCs already have silver_v1
 existing_tcs = set(golden_coll.distinct("tc_number", {"run_label": RUN_LABEL}))
 print(f"Existing silver_v1 TCs: {sorted(existing_tcs)}")
 
-# Load local PDF files
-pdf_files = sorted(TEST_DOCS_DIR.glob("*.pdf"), key=lambda x: tc_sort_key(x.name))
+# Load local PDF files (one directory listing; sort key computed once per file)
+pdf_files = [p for p in TEST_DOCS_DIR.iterdir() if p.suffix == ".pdf"] if TEST_DOCS_DIR.is_dir() else []
+pdf_files.sort(key=lambda p: (tc_sort_key(p.name), p.name))
 print(f"Total local PDFs: {len(pdf_files)}")
 
 # Filter to missing TCs
@@ -44,37 +68,126 @@ if not missing:
     print("All TCs already captured! Nothing to do.")
     sys.exit(0)
 
-# Run each missing TC
+# Run missing TCs concurrently, storing results in batches as they complete
 succeeded = 0
 failed = 0
-
-for pdf, tc, desc in missing:
-    print(f"\n--- Running {tc} — {desc} ({pdf.name}) ---")
+pending_inserts = []
+
+
+def dump_unsaved(docs):
+    """Write golden outputs that could not be stored to a JSON file."""
+    dump_path = Path(f"unsaved_{RUN_LABEL}_{datetime.now():%Y%m%d-%H%M%S-%f}.json")
+    dump_path.write_text(json.dumps(docs, default=str, indent=2))
+    print(f"  Dumped {len(docs)} unsaved result(s) to {dump_path}")
+
+
+def insert_one_by_one(batch, final):
+    """Fallback after a batch-level error: isolate bad documents. Returns (stored, failed)."""
+    stored = failed = 0
+    bad = []
+    for i, doc in enumerate(batch):
+        try:
+            golden_coll.insert_one(doc)
+            stored += 1
+        except DuplicateKeyError:
+            stored += 1  # Already written by the partial insert_many
+        except ConnectionFailure as e:
+            rest = batch[i:]
+            print(f"  INSERT FAILED — {', '.join(d['tc_number'] for d in rest)}: {str(e)[:200]}")
+            if final:
+                bad.extend(rest)
+                failed += len(rest)
+            else:
+                pending_inserts.extend(rest)
+                print(f"  Keeping {len(rest)} result(s) buffered for the next flush")
+            break
+        except (InvalidDocument, PyMongoError) as e:  # e.g. DocumentTooLarge
+            failed += 1
+            bad.append(doc)
+            print(f"  INSERT FAILED — {doc['tc_number']}: {str(e)[:200]}")
+    if bad:
+        dump_unsaved(bad)
+    return stored, failed
+
+
+def flush_inserts(final=False):
+    """Insert buffered golden outputs in one round-trip; returns (stored, failed).
+
+    The buffer is only cleared once MongoDB has answered. On a connection error
+    the batch stays buffered for the next flush (the final flush dumps it to a
+    JSON file). Any other batch-level error is retried document by document so
+    one bad document fails only its own TC.
+    """
+    if not pending_inserts:
+        return 0, 0
+    batch = pending_inserts[:]
     try:
-        resp, meta = submit_document(pdf)
-
-        if resp.status_code == 200:
-            full_response = json.loads(resp.text)
-            findings = parse_findings_summary(resp.text)
-
-            golden_coll.insert_one({
-                "filename": pdf.name,
-                "tc_number": tc,
-                "run_label": RUN_LABEL,
-                "api_response": full_response,
-                "findings_summary": findings,
-                "total_findings": sum(findings.values()),
-                "status_code": resp.status_code,
-                "metadata": meta,
-                "created_at": datetime.utcnow(),
-            })
-            succeeded += 1
-            print(f"  OK — {sum(findings.values())} findings captured")
-        else:
+        golden_coll.insert_many(batch, ordered=False)
+    except BulkWriteError as e:
+        pending_inserts.clear()
+        lost = 0
+        for err in e.details.get("writeErrors", []):
+            if err.get("code") == 11000:
+                continue  # Already written by an earlier attempt of this batch
+            lost += 1
+            print(f"  INSERT FAILED — {batch[err['index']]['tc_number']}: {err.get('errmsg', '')[:200]}")
+        return len(batch) - lost, lost
+    except ConnectionFailure as e:  # e.g. AutoReconnect, NetworkTimeout
+        tcs = ", ".join(doc["tc_number"] for doc in batch)
+        print(f"  INSERT FAILED — {tcs}: {str(e)[:200]}")
+        if not final:
+            print(f"  Keeping {len(batch)} result(s) buffered for the next flush")
+            return 0, 0
+        pending_inserts.clear()
+        dump_unsaved(batch)
+        return 0, len(batch)
+    except (InvalidDocument, PyMongoError) as e:  # e.g. DocumentTooLarge
+        print(f"  Batch insert failed ({str(e)[:200]}); inserting one by one")
+        pending_inserts.clear()
+        return insert_one_by_one(batch, final)
+    pending_inserts.clear()
+    return len(batch), 0
+
+
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    futures = {pool.submit(submit_document, pdf): (pdf, tc, desc) for pdf, tc, desc in missing}
+    print(f"\nSubmitted {len(futures)} TCs ({MAX_WORKERS} at a time)")
+
+    for future in as_completed(futures):
+        pdf, tc, desc = futures[future]
+        print(f"\n--- {tc} — {desc} ({pdf.name}) ---")
+        try:
+            resp, meta = future.result()
+
+            if resp.status_code == 200:
+                full_response = json.loads(resp.content)
+                findings = parse_findings_summary(full_response)
+
+                pending_inserts.append({
+                    "filename": pdf.name,
+                    "tc_number": tc,
+                    "run_label": RUN_LABEL,
+                    "api_response": full_response,
+                    "findings_summary": findings,
+                    "total_findings": sum(findings.values()),
+                    "status_code": resp.status_code,
+                    "metadata": meta,
+                    "created_at": datetime.utcnow(),
+                })
+                print(f"  OK — {sum(findings.values())} findings captured")
+                if len(pending_inserts) >= INSERT_BATCH_SIZE:
+                    stored, lost = flush_inserts()
+                    succeeded += stored
+                    failed += lost
+            else:
+                failed += 1
+                print(f"  FAILED — HTTP {resp.status_code}: {resp.text[:200]}")
+        except Exception as e:
             failed += 1
-            print(f"  FAILED — HTTP {resp.status_code}: {resp.text[:200]}")
-    except Exception as e:
-        failed += 1
-        print(f"  ERROR — {str(e)[:300]}")
+            print(f"  ERROR — {str(e)[:300]}")
+
+stored, lost = flush_inserts(final=True)
+succeeded += stored
+failed += lost
 
 print(f"\n=== Done! {succeeded} succeeded, {failed} failed out of {len(missing)} ===")
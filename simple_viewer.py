@@ -1,10 +1,11 @@
+import math
 import os
 from datetime import datetime, timedelta
 
 import pandas as pd
 import streamlit as st
 from bson import ObjectId
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,7 +28,13 @@ def get_mongo_client():
     if not uri:
         st.error("MONGODB_URI not found in .env")
         st.stop()
-    return MongoClient(uri)
+    # Cached, so one pool is shared by every rerun and session
+    return MongoClient(
+        uri,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        waitQueueTimeoutMS=30000,
+    )
 
 
 def get_collection():
@@ -44,20 +51,36 @@ ARTIFACT_TYPES = [
 
 REVIEW_FIELDS = ["accept", "accept_with_changes", "reject", "reject_reason"]
 
+# Fields needed for the record dropdown; the selected record is loaded in full.
+DOC_LIST_PROJECTION = {"metadata.others.document_metadata.document_name": 1, "created_at": 1}
+DOC_LIST_LIMIT = 500  # safety cap on the "all records" dropdown
+
 
 # ---------------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------------
+# Cached so new sessions opening together share one query; an explicit
+# Fetch Records click clears them so it always sees newly written records.
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_docs_by_date(date_val):
     coll = get_collection()
     start = datetime.combine(date_val, datetime.min.time())
     end = start + timedelta(days=1)
-    return list(coll.find({"created_at": {"$gte": start, "$lt": end}}))
+    cursor = coll.find({"created_at": {"$gte": start, "$lt": end}}, DOC_LIST_PROJECTION)
+    return list(cursor.batch_size(200))
 
 
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_all_docs():
     coll = get_collection()
-    return list(coll.find().sort("created_at", -1))
+    cursor = coll.find({}, DOC_LIST_PROJECTION).sort("created_at", -1)
+    return list(cursor.batch_size(200).limit(DOC_LIST_LIMIT))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_doc(doc_id):
+    """Load the full document for the selected record."""
+    return get_collection().find_one({"_id": ObjectId(doc_id)})
 
 
 def extract_findings(doc, source="sequential_reasoner"):
@@ -99,40 +122,57 @@ def extract_findings(doc, source="sequential_reasoner"):
     return rows
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def build_findings_view(doc_id, source):
+    """Findings table and (total, accepted, rejected, changed) counts for a record.
+
+    Cached per record and source; Save Changes clears it so every session sees
+    the written review fields. Returns None if the record no longer exists.
+    """
+    doc = fetch_doc(doc_id)
+    if not doc:
+        return None
+    df = pd.DataFrame(extract_findings(doc, source=source))
+    if df.empty:
+        return df, (0, 0, 0, 0)
+    counts = (
+        len(df),
+        int(df["accept"].sum()),
+        int(df["reject"].sum()),
+        int(df["accept_with_changes"].sum()),
+    )
+    return df, counts
+
+
 # ---------------------------------------------------------------------------
 # MongoDB write-back
 # ---------------------------------------------------------------------------
-def save_finding(row):
-    """Persist a single finding's review fields back to MongoDB."""
-    coll = get_collection()
-    doc_id = ObjectId(row["_doc_id"])
+def _review_update(row):
+    """$set of a finding's review fields, addressed by its section path."""
     base_path = f"{row['_source']}.{row['_art_key']}.sections.{row['_section_idx']}"
+    return {"$set": {f"{base_path}.{field}": row[field] for field in REVIEW_FIELDS}}
 
-    update = {}
-    for field in REVIEW_FIELDS:
-        update[f"{base_path}.{field}"] = row[field]
 
-    coll.update_one({"_id": doc_id}, {"$set": update})
+def save_finding(row):
+    """Persist a single finding's review fields back to MongoDB."""
+    coll = get_collection()
+    coll.update_one({"_id": ObjectId(row["_doc_id"])}, _review_update(row))
 
 
 def save_all_changes(original_df, edited_df):
     """Compare original vs edited, persist only changed rows. Returns count."""
-    changed = 0
-    for idx in edited_df.index:
-        if idx not in original_df.index:
-            continue
-        orig = original_df.loc[idx]
-        edit = edited_df.loc[idx]
-        # Check if any review field changed
-        diff = False
-        for f in REVIEW_FIELDS:
-            if orig[f] != edit[f]:
-                diff = True
-                break
-        if diff:
-            save_finding(edit)
-            changed += 1
-    return changed
+    common = edited_df.index.intersection(original_df.index)
+    edited = edited_df.loc[common]
+    # Vectorized diff of the review fields instead of comparing row by row
+    changed_mask = original_df.loc[common, REVIEW_FIELDS].ne(edited[REVIEW_FIELDS]).any(axis=1)
+    ops = [
+        UpdateOne({"_id": ObjectId(row["_doc_id"])}, _review_update(row))
+        for row in edited[changed_mask].to_dict("records")
+    ]
+    # One round-trip for all changed rows
+    if ops:
+        get_collection().bulk_write(ops, ordered=False)
+    return len(ops)
 
 
 # ---------------------------------------------------------------------------
@@ -144,6 +184,8 @@ review_date = st.sidebar.date_input("Review Date", value=datetime.now().date())
 fetch_clicked = st.sidebar.button("Fetch Records", type="primary", use_container_width=True)
 
 if fetch_clicked:
+    fetch_docs_by_date.clear()
+    fetch_all_docs.clear()
     docs = fetch_docs_by_date(review_date)
     if not docs:
         docs = fetch_all_docs()
@@ -180,12 +222,12 @@ for d in docs:
         except Exception:
             ts = str(created)[:16]
     label = f"{name} ({ts})" if ts else name
-    doc_options[str(d["_id"])] = {"label": label, "doc": d}
+    doc_options[str(d["_id"])] = label
 
 selected_id = st.sidebar.selectbox(
     "Review Record",
     options=list(doc_options.keys()),
-    format_func=lambda x: doc_options[x]["label"],
+    format_func=lambda x: doc_options[x],
 )
 
 source = st.sidebar.radio("Data Source", ["sequential_reasoner", "raw_output"], horizontal=True)
@@ -198,22 +240,19 @@ st.sidebar.caption("Edits to Accept / Reject auto-save to the database.")
 # ---------------------------------------------------------------------------
 st.title("PO2 Test Bench — Record Viewer")
 
-selected_doc = doc_options[selected_id]["doc"]
-findings = extract_findings(selected_doc, source=source)
+view = build_findings_view(selected_id, source)
+if view is None:
+    st.warning("This record no longer exists. Fetch records again.")
+    st.stop()
+df, (total, accepted, rejected, changed) = view
 
-if not findings:
+if df.empty:
     st.warning("No findings in this record.")
     st.stop()
 
-df = pd.DataFrame(findings)
-
 # ---------------------------------------------------------------------------
 # Summary metrics
 # ---------------------------------------------------------------------------
-total = len(df)
-accepted = int(df["accept"].sum())
-rejected = int(df["reject"].sum())
-changed = int(df["accept_with_changes"].sum())
 unreviewed = total - accepted - rejected - changed
 
 c1, c2, c3, c4, c5 = st.columns(5)
@@ -273,12 +312,9 @@ with col_save:
         count = save_all_changes(df, save_df)
         if count > 0:
             st.session_state["last_save"] = f"Saved {count} finding(s) to database."
-            # Refresh the doc from DB so the page reflects saved state
-            refreshed = get_collection().find_one({"_id": ObjectId(selected_id)})
-            if refreshed:
-                doc_options[selected_id]["doc"] = refreshed
-                idx = next(i for i, d in enumerate(st.session_state["docs"]) if str(d["_id"]) == selected_id)
-                st.session_state["docs"][idx] = refreshed
+            # Reload the doc from DB on rerun so the page reflects saved state
+            fetch_doc.clear()
+            build_findings_view.clear()
             st.rerun()
         else:
             st.session_state["last_save"] = "No changes detected."
@@ -294,27 +330,44 @@ with col_status:
 st.divider()
 st.subheader("Finding Details")
 
-for i, row in df.iterrows():
+# Only one page of expanders is built per rerun
+DETAILS_PAGE_SIZE = 20
+detail_cols = [
+    "accept", "accept_with_changes", "reject", "reject_reason", "sentence",
+    "category", "artifact_type", "page", "rule_citation", "observations",
+    "recommendations", "summary",
+]
+num_pages = math.ceil(len(df) / DETAILS_PAGE_SIZE)
+details_page = 1
+if num_pages > 1:
+    details_page = st.number_input(
+        f"Page (of {num_pages})", min_value=1, max_value=num_pages, value=1,
+        key=f"details_page_{selected_id}_{source}",
+    )
+start = (details_page - 1) * DETAILS_PAGE_SIZE
+page_df = df.iloc[start:start + DETAILS_PAGE_SIZE]
+
+for row in page_df[detail_cols].itertuples(index=False):
     status = (
-        "Accepted" if row["accept"]
-        else "Rejected" if row["reject"]
-        else "Accept w/ Changes" if row["accept_with_changes"]
+        "Accepted" if row.accept
+        else "Rejected" if row.reject
+        else "Accept w/ Changes" if row.accept_with_changes
         else "Unreviewed"
     )
     color = {"Accepted": "green", "Rejected": "red", "Accept w/ Changes": "orange", "Unreviewed": "gray"}[status]
-    sentence_preview = row["sentence"][:80] + "..." if len(str(row["sentence"])) > 80 else row["sentence"]
-    label = f":{color}[**{status}**] {row['category']} — {sentence_preview}"
+    sentence_preview = row.sentence[:80] + "..." if len(str(row.sentence)) > 80 else row.sentence
+    label = f":{color}[**{status}**] {row.category} — {sentence_preview}"
 
     with st.expander(label, expanded=False):
         col_a, col_b = st.columns(2)
         with col_a:
-            st.markdown(f"**Artifact Type:** {row['artifact_type']}")
-            st.markdown(f"**Page:** {row['page']}")
-            st.markdown(f"**Category:** {row['category']}")
-            st.markdown(f"**Rule Citation:** {row['rule_citation']}")
+            st.markdown(f"**Artifact Type:** {row.artifact_type}")
+            st.markdown(f"**Page:** {row.page}")
+            st.markdown(f"**Category:** {row.category}")
+            st.markdown(f"**Rule Citation:** {row.rule_citation}")
         with col_b:
-            st.markdown(f"**Observations:** {row['observations']}")
-            st.markdown(f"**Recommendations:** {row['recommendations']}")
-            st.markdown(f"**Summary:** {row['summary']}")
-            if row["reject_reason"]:
-                st.markdown(f"**Reject Reason:** :red[{row['reject_reason']}]")
+            st.markdown(f"**Observations:** {row.observations}")
+            st.markdown(f"**Recommendations:** {row.recommendations}")
+            st.markdown(f"**Summary:** {row.summary}")
+            if row.reject_reason:
+                st.markdown(f"**Reject Reason:** :red[{row.reject_reason}]")
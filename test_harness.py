@@ -1,4 +1,6 @@
+import functools
 import os
+import random
 import re
 import json
 import time
@@ -9,8 +11,11 @@ from urllib.parse import quote
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bson import ObjectId, Binary
 from pymongo import MongoClient
+from pymongo.errors import PyMongoError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -24,7 +29,7 @@ st.set_page_config(page_title="PO2 Test Bench", page_icon="\U0001f9ea", layout="
 API_BASE = "https://po2-api-dev.turboverse.co"
 GCS_BUCKET = "gs://po2_documents/uploads"
 AUTH_TOKEN = os.getenv("API_AUTH_TOKEN", "")
-POLL_INTERVAL = 10  # seconds between status checks
+POLL_INTERVAL = 10  # max seconds between status checks (polls back off up to this)
 POLL_TIMEOUT = 600  # max seconds to wait for result
 TEST_DOCS_DIR = Path(__file__).resolve().parent / "test_docs"
 
@@ -60,14 +65,24 @@ CATEGORY_THEMES = {
 THEME_ORDER = {v: i for i, v in enumerate(CATEGORY_THEMES.values())}
 
 
+# Lowercased once; cat_to_theme runs for every finding on every rerun.
+_THEME_BY_KEY_LOWER = {k.lower(): v for k, v in CATEGORY_THEMES.items()}
+_THEME_FIRST_WORD = [(k.split()[0].lower(), v) for k, v in CATEGORY_THEMES.items()]
+
+
+@functools.lru_cache(maxsize=512)
 def cat_to_theme(cat):
     """Map a raw category name to its short theme label."""
-    for key, theme in CATEGORY_THEMES.items():
-        if key.lower() in cat.lower() or cat.lower() in key.lower():
+    cl = cat.lower()
+    theme = _THEME_BY_KEY_LOWER.get(cl)
+    if theme:
+        return theme
+    for key, theme in _THEME_BY_KEY_LOWER.items():
+        if key in cl or cl in key:
             return theme
     # Fuzzy: match first significant word
-    for key, theme in CATEGORY_THEMES.items():
-        if key.split()[0].lower() in cat.lower():
+    for word, theme in _THEME_FIRST_WORD:
+        if word in cl:
             return theme
     return cat[:25]
 
@@ -75,28 +90,55 @@ def cat_to_theme(cat):
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+@st.cache_resource
 def get_mongo():
     uri = os.getenv("MONGODB_URI")
-    return MongoClient(uri)["PO2xNW"]
+    client = MongoClient(
+        uri,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        waitQueueTimeoutMS=30000,
+    )
+    return client["PO2xNW"]
+
+
+# Compiled once; short_name/tc_sort_key run for every file on every rerun.
+_TC_NUM_RE = re.compile(r"TC(\d+)")
+_TC_RE = re.compile(r"(TC\d+)")
+_DIGITS_RE = re.compile(r"\d+")
+_VARIANT_RE = re.compile(r"[-_ ](1[A-C])\b")
+_TC_SPLIT_RE = re.compile(r"TC\d+[_]?")
+_WS_RE = re.compile(r"\s+")
+_TAIL_NOISE = [
+    (re.compile(r"^(FS|PP|CM|BR|RMCM)[_ ]+"), ""),
+    (re.compile(r"^2[_ ]*(?:Updated)?[_ ]*"), ""),
+    (re.compile(r"(?:TEST SAMPLE|Test Sample)"), ""),
+    (re.compile(r"(?:Updated)"), ""),
+    (re.compile(r"Copy of 2"), ""),
+    (re.compile(r"[_ ]*\d{0,2}[A-Z]{0,3}\d{4}[_ ]*"), " "),  # date patterns
+    (re.compile(r"[-_ ]*(1[A-C])\b"), ""),
+]
 
 
+@functools.lru_cache(maxsize=1024)
 def tc_sort_key(filename):
-    m = re.search(r"TC(\d+)", filename)
+    m = _TC_NUM_RE.search(filename)
     return int(m.group(1)) if m else 999
 
 
+@functools.lru_cache(maxsize=1024)
 def short_name(filename):
     """Extract TC number and short description."""
     name = filename.replace(".pdf", "")
-    tc_match = re.search(r"(TC\d+)", name)
+    tc_match = _TC_RE.search(name)
     tc = tc_match.group(1) if tc_match else "TC?"
-    tc_num = re.search(r"\d+", tc)
+    tc_num = _DIGITS_RE.search(tc)
     if tc_num:
         tc = f"TC{int(tc_num.group()):02d}"
 
     # Extract variant suffix like -1A, -1B, -1C before cleaning
     variant = ""
-    v_match = re.search(r"[-_ ](1[A-C])\b", name)
+    v_match = _VARIANT_RE.search(name)
     if v_match:
         variant = f" ({v_match.group(1)})"
 
@@ -105,21 +147,15 @@ def short_name(filename):
         variant = " (alt)"
 
     # Get everything after TC##
-    after_tc = re.split(r"TC\d+[_]?", name, maxsplit=1)
+    after_tc = _TC_SPLIT_RE.split(name, maxsplit=1)
     tail = after_tc[1].strip("_ ") if len(after_tc) > 1 else name
 
-    # Remove noise
-    tail = re.sub(r"^(FS|PP|CM|BR|RMCM)[_ ]+", "", tail)
-    tail = re.sub(r"^2[_ ]*(?:Updated)?[_ ]*", "", tail)
-    tail = re.sub(r"(?:TEST SAMPLE|Test Sample)", "", tail)
-    tail = re.sub(r"(?:Updated)", "", tail)
-    tail = re.sub(r"Copy of 2", "", tail)
-    # Remove date patterns
-    tail = re.sub(r"[_ ]*\d{0,2}[A-Z]{0,3}\d{4}[_ ]*", " ", tail)
-    tail = re.sub(r"[-_ ]*(1[A-C])\b", "", tail)
+    # Remove noise (prefixes, sample/updated markers, dates, variants)
+    for pattern, repl in _TAIL_NOISE:
+        tail = pattern.sub(repl, tail)
     # Clean underscores to spaces
     tail = tail.replace("_", " ")
-    tail = re.sub(r"\s+", " ", tail).strip(" -_")
+    tail = _WS_RE.sub(" ", tail).strip(" -_")
 
     if not tail:
         tail = guess_doc_type(filename)
@@ -183,6 +219,16 @@ def build_metadata(filename):
 #     return response, metadata
 
 
+# Shared keep-alive session so polls reuse one connection instead of a new
+# TLS handshake each time. Retries cover transient gateway errors (GETs only).
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+))
+
+
 def _api_headers():
     return {
         "accept": "application/json",
@@ -198,7 +244,7 @@ def _post_analyze(filename, metadata):
     headers = _api_headers()
 
     # 1. Kick off the analysis
-    resp = requests.post(url, headers=headers, json=metadata, timeout=60)
+    resp = _SESSION.post(url, headers=headers, json=metadata, timeout=60)
     resp.raise_for_status()
     process_id = resp.json().get("process_id")
     if not process_id:
@@ -206,11 +252,15 @@ def _post_analyze(filename, metadata):
 
     # 2. Poll /output/{process_id} until COMPLETED or timeout
     poll_url = f"{API_BASE}/output/{process_id}"
+    # Back off from 1s up to POLL_INTERVAL; downward-only jitter spreads out
+    # concurrent polls without ever exceeding the cap
     elapsed = 0
+    delay = 1.0
     while elapsed < POLL_TIMEOUT:
-        time.sleep(POLL_INTERVAL)
-        elapsed += POLL_INTERVAL
-        poll_resp = requests.get(poll_url, headers=headers, timeout=30)
+        time.sleep(delay)
+        elapsed += delay
+        delay = min(delay * 1.7, POLL_INTERVAL) * random.uniform(0.8, 1.0)
+        poll_resp = _SESSION.get(poll_url, headers=headers, timeout=30)
         poll_resp.raise_for_status()
         data = poll_resp.json()
         status = data.get("status", "")
@@ -233,11 +283,15 @@ def submit_document(filepath):
     return _post_analyze(filename, metadata)
 
 
-def parse_findings_from_response(resp_text):
+def parse_findings_from_response(resp_body):
+    # json.loads takes the raw bytes, skipping requests' charset detection/decode
     try:
-        data = json.loads(resp_text)
+        data = json.loads(resp_body)
     except Exception:
         return {}
+    # Error payloads / empty results: nothing to count
+    if not isinstance(data, dict) or not (data.get("raw_output") or data.get("sequential_reasoner")):
+        return {}
     categories = Counter()
     total = 0
     for source_key in ["raw_output", "sequential_reasoner"]:
@@ -257,20 +311,45 @@ def parse_findings_from_response(resp_text):
     return dict(categories)
 
 
+# ---------------------------------------------------------------------------
+# Persisted results (survive refreshes and new sessions, per Run By name per day)
+# ---------------------------------------------------------------------------
+def _results_scope(user):
+    return {"user": user, "day": datetime.now().strftime("%Y-%m-%d")}
+
+
+def load_saved_results(user):
+    """Today's stored TC results for this user, keyed by filename."""
+    coll = get_mongo()["po2_harness_runs"]
+    cursor = coll.find(_results_scope(user), {"_id": 0, "user": 0, "day": 0}).batch_size(100)
+    return {doc.pop("name"): doc for doc in cursor}
+
+
+def persist_result(user, name, result):
+    get_mongo()["po2_harness_runs"].update_one(
+        {**_results_scope(user), "name": name}, {"$set": result}, upsert=True,
+    )
+
+
+def clear_saved_results(user):
+    get_mongo()["po2_harness_runs"].delete_many(_results_scope(user))
+
+
 # ---------------------------------------------------------------------------
 # Load test documents
 # ---------------------------------------------------------------------------
-@st.cache_data(ttl=600)
+@st.cache_data(ttl=3600)
 def load_test_docs():
+    # Submissions go through GCS, so the stored PDF bytes are never needed here
     db = get_mongo()
-    return list(db["test_documents"].find().sort("filename", 1))
+    return list(db["test_documents"].find({}, {"file_data": 0}).sort("filename", 1))
 
 
 test_docs = load_test_docs()
 use_mongo = len(test_docs) > 0
 
 if not use_mongo:
-    pdf_files = sorted(TEST_DOCS_DIR.glob("*.pdf"))
+    pdf_files = sorted(p for p in TEST_DOCS_DIR.iterdir() if p.suffix == ".pdf") if TEST_DOCS_DIR.is_dir() else []
     if not pdf_files:
         st.error("No test documents found.")
         st.stop()
@@ -279,16 +358,39 @@ items = test_docs if use_mongo else pdf_files
 items = sorted(items, key=lambda x: tc_sort_key(x["filename"] if use_mongo else x.name))
 doc_count = len(items)
 
-if "results" not in st.session_state:
-    st.session_state["results"] = {}
-
-results = st.session_state["results"]
-
 # ---------------------------------------------------------------------------
 # Header
 # ---------------------------------------------------------------------------
 st.title("PO2 Test Bench")
 
+# Results are persisted per Run By name; kept in the URL so a refresh restores them
+run_by = st.text_input(
+    "Run By", value=st.query_params.get("run_by", ""), placeholder="e.g. Latha",
+    help="Today's results are saved under this name and reload after a refresh. "
+         "Leave blank to keep results in this browser session only.",
+).strip()
+if run_by:
+    st.query_params["run_by"] = run_by
+elif "run_by" in st.query_params:
+    del st.query_params["run_by"]
+
+if st.session_state.get("results_user") != run_by:
+    # Unsaved results from before a name was entered stay on screen
+    carried = st.session_state.get("results", {}) if not st.session_state.get("results_user") else {}
+    saved = {}
+    if run_by:
+        try:
+            saved = load_saved_results(run_by)
+        except PyMongoError as e:
+            st.warning(f"Could not load saved results: {str(e)[:200]}")
+    st.session_state["results"] = {**saved, **carried}
+    st.session_state["results_user"] = run_by
+
+results = st.session_state["results"]
+
+if "persist_warning" in st.session_state:
+    st.warning(st.session_state.pop("persist_warning"))
+
 now_str = datetime.now().strftime("%b %d, %Y  %I:%M %p")
 passed = sum(1 for r in results.values() if r.get("success"))
 failed = sum(1 for r in results.values() if not r.get("success"))
@@ -305,6 +407,11 @@ st.divider()
 
 if st.button("Clear Results"):
     st.session_state["results"] = {}
+    if run_by:
+        try:
+            clear_saved_results(run_by)  # only this name's rows for today
+        except PyMongoError as e:
+            st.session_state["persist_warning"] = f"Could not clear saved results: {str(e)[:200]}"
     st.rerun()
 
 # ---------------------------------------------------------------------------
@@ -335,19 +442,26 @@ with col_left:
                         resp, meta = submit_from_mongo(item)
                     else:
                         resp, meta = submit_document(item)
-                    st.session_state["results"][name] = {
+                    result = {
                         "status_code": resp.status_code,
                         "success": resp.status_code == 200,
-                        "response": resp.text[:5000],
-                        "findings": parse_findings_from_response(resp.text) if resp.status_code == 200 else {},
+                        "response": resp.content[:5000].decode("utf-8", errors="replace"),
+                        "findings": parse_findings_from_response(resp.content) if resp.status_code == 200 else {},
                         "timestamp": datetime.now().isoformat(),
                     }
                 except Exception as e:
-                    st.session_state["results"][name] = {
+                    result = {
                         "status_code": 0, "success": False,
                         "response": str(e), "findings": {},
                         "timestamp": datetime.now().isoformat(),
                     }
+            st.session_state["results"][name] = result
+            # A failed save must not discard or relabel the API result
+            if run_by:
+                try:
+                    persist_result(run_by, name, result)
+                except PyMongoError as e:
+                    st.session_state["persist_warning"] = f"{tc} ran, but saving its result failed: {str(e)[:200]}"
             st.rerun()
 
 # ---- RIGHT: Dashboard ----